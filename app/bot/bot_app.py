@@ -7,6 +7,7 @@ from aiogram.enums import ParseMode
 from aiogram.fsm.storage.memory import MemoryStorage
 
 from app.config.settings import settings
+from app.db import writer
 from app.utils.logging import get_logger
 
 log = get_logger(__name__)
@@ -26,5 +27,14 @@ def create_bot() -> Bot:
 
 
 def create_dispatcher() -> Dispatcher:
-    dp = Dispatcher(storage=MemoryStorage())
+    if settings.REDIS_URL:
+        # optional dependency: only needed when running several workers
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        storage = RedisStorage.from_url(settings.REDIS_URL, state_ttl=3600, data_ttl=3600)
+    else:
+        storage = MemoryStorage()
+    dp = Dispatcher(storage=storage)
+    dp.startup.register(writer.start)
+    dp.shutdown.register(writer.stop)
     return dp
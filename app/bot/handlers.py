@@ -1,29 +1,34 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import os
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional
 
 from aiogram import F, Router
 from aiogram.enums import ChatType, ParseMode
 from aiogram.filters import Command
+from aiogram.filters.callback_data import CallbackData
 from aiogram.types import (
     CallbackQuery,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
+    FSInputFile,
     InlineQuery,
-    InputFile,
+    InputMediaDocument,
     Message,
     InlineQueryResultArticle,
     InputTextMessageContent,
 )
 
-from app.config.settings import settings
-from app.db import queries
+from app.config.settings import ADMIN_IDS, WHITELIST_IDS, settings
+from app.db import queries, writer
 from app.extractors.downloader import download, resolve_redirect
-from app.extractors.registry import list_visible_extractors, match_extractor
+from app.extractors.registry import Extractor, get_extractor, list_visible_extractors, match_extractor
 from app.i18n.localizer import available_languages, t
 from app.utils.logging import get_logger
 
@@ -31,17 +36,29 @@ log = get_logger(__name__)
 
 router = Router()
 
-URL_RE = re.compile(r"https?://\S+", re.IGNORECASE)
+URL_RE = re.compile(r"\bhttps?://[^\s<>\"']+", re.IGNORECASE)
+
+
+class SettingsCallback(CallbackData, prefix="s"):
+    """Settings panel buttons, e.g. section="toggle", action="captions"."""
+
+    section: str
+    action: str
+
+
+# Max links from a single message downloaded at the same time.
+MAX_PARALLEL_URLS = 4
+
+# Telegram accepts at most 10 items per media group.
+MEDIA_GROUP_SIZE = 10
 
 
 def _is_admin(user_id: int) -> bool:
-    return user_id in set(settings.ADMINS or [])
+    return user_id in ADMIN_IDS
 
 
 def _is_whitelisted(user_id: int) -> bool:
-    if not settings.WHITELIST:
-        return True
-    return user_id in set(settings.WHITELIST or [])
+    return not WHITELIST_IDS or user_id in WHITELIST_IDS
 
 
 def _chat_type_str(msg: Message) -> str:
@@ -50,6 +67,9 @@ def _chat_type_str(msg: Message) -> str:
     return "private"
 
 
+# Keyboards only depend on the language and a few settings values, so the
+# built markups are memoized on those and shared between chats.
+@lru_cache(maxsize=512)
 def main_keyboard(lang: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -63,7 +83,25 @@ def main_keyboard(lang: str) -> InlineKeyboardMarkup:
 
 
 def settings_keyboard(chat: queries.ChatRow) -> InlineKeyboardMarkup:
-    lang = chat.language
+    return _settings_keyboard(
+        chat.language,
+        chat.captions,
+        chat.silent,
+        chat.nsfw,
+        chat.delete_links,
+        chat.media_album_limit,
+    )
+
+
+@lru_cache(maxsize=512)
+def _settings_keyboard(
+    lang: str,
+    captions: bool,
+    silent: bool,
+    nsfw: bool,
+    delete_links: bool,
+    media_album_limit: int,
+) -> InlineKeyboardMarkup:
     def onoff(v: bool) -> str:
         return t("EnabledButton", lang) if v else t("DisabledButton", lang)
 
@@ -71,40 +109,40 @@ def settings_keyboard(chat: queries.ChatRow) -> InlineKeyboardMarkup:
         inline_keyboard=[
             [
                 InlineKeyboardButton(
-                    text=f"{t('LanguageButton', lang)}: {available_languages().get(chat.language, chat.language)}",
-                    callback_data="settings.select.language",
+                    text=f"{t('LanguageButton', lang)}: {available_languages().get(lang, lang)}",
+                    callback_data=SettingsCallback(section="select", action="language").pack(),
                 )
             ],
             [
                 InlineKeyboardButton(
-                    text=f"{t('CaptionsButton', lang)}: {onoff(chat.captions)}",
-                    callback_data="settings.toggle.captions",
+                    text=f"{t('CaptionsButton', lang)}: {onoff(captions)}",
+                    callback_data=SettingsCallback(section="toggle", action="captions").pack(),
                 ),
                 InlineKeyboardButton(
-                    text=f"{t('SilentButton', lang)}: {onoff(chat.silent)}",
-                    callback_data="settings.toggle.silent",
+                    text=f"{t('SilentButton', lang)}: {onoff(silent)}",
+                    callback_data=SettingsCallback(section="toggle", action="silent").pack(),
                 ),
             ],
             [
                 InlineKeyboardButton(
-                    text=f"{t('NsfwButton', lang)}: {onoff(chat.nsfw)}",
-                    callback_data="settings.toggle.nsfw",
+                    text=f"{t('NsfwButton', lang)}: {onoff(nsfw)}",
+                    callback_data=SettingsCallback(section="toggle", action="nsfw").pack(),
                 ),
                 InlineKeyboardButton(
-                    text=f"{t('DeleteProcessedButton', lang)}: {onoff(chat.delete_links)}",
-                    callback_data="settings.toggle.delete_links",
+                    text=f"{t('DeleteProcessedButton', lang)}: {onoff(delete_links)}",
+                    callback_data=SettingsCallback(section="toggle", action="delete_links").pack(),
                 ),
             ],
             [
                 InlineKeyboardButton(
-                    text=f"{t('MediaAlbumButton', lang)}: {chat.media_album_limit}",
-                    callback_data="settings.select.album_limit",
+                    text=f"{t('MediaAlbumButton', lang)}: {media_album_limit}",
+                    callback_data=SettingsCallback(section="select", action="album_limit").pack(),
                 )
             ],
             [
                 InlineKeyboardButton(
                     text=t("DisabledExtractorsButton", lang),
-                    callback_data="settings.select.disabled_extractors",
+                    callback_data=SettingsCallback(section="select", action="disabled_extractors").pack(),
                 )
             ],
             [
@@ -116,33 +154,45 @@ def settings_keyboard(chat: queries.ChatRow) -> InlineKeyboardMarkup:
 
 
 def languages_keyboard(chat: queries.ChatRow) -> InlineKeyboardMarkup:
-    langs = available_languages()
+    return _languages_keyboard(chat.language)
+
+
+@lru_cache(maxsize=512)
+def _languages_keyboard(lang: str) -> InlineKeyboardMarkup:
     buttons = []
-    for code, name in sorted(langs.items(), key=lambda x: x[0]):
-        mark = " ✅" if code == chat.language else ""
-        buttons.append([InlineKeyboardButton(text=f"{name}{mark}", callback_data=f"settings.language.{code}")])
-    buttons.append([InlineKeyboardButton(text=t("BackButton", chat.language), callback_data="settings")])
+    for code, name in available_languages().items():
+        mark = " ✅" if code == lang else ""
+        buttons.append([InlineKeyboardButton(text=f"{name}{mark}", callback_data=SettingsCallback(section="language", action=code).pack())])
+    buttons.append([InlineKeyboardButton(text=t("BackButton", lang), callback_data="settings")])
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
 def album_limit_keyboard(chat: queries.ChatRow) -> InlineKeyboardMarkup:
-    lang = chat.language
+    return _album_limit_keyboard(chat.language, chat.media_album_limit)
+
+
+@lru_cache(maxsize=512)
+def _album_limit_keyboard(lang: str, media_album_limit: int) -> InlineKeyboardMarkup:
     limits = [1, 2, 3, 5, 10, 15, 20]
     rows = []
     for n in limits:
-        mark = " ✅" if n == chat.media_album_limit else ""
-        rows.append([InlineKeyboardButton(text=f"{n}{mark}", callback_data=f"settings.album.{n}")])
+        mark = " ✅" if n == media_album_limit else ""
+        rows.append([InlineKeyboardButton(text=f"{n}{mark}", callback_data=SettingsCallback(section="album", action=str(n)).pack())])
     rows.append([InlineKeyboardButton(text=t("BackButton", lang), callback_data="settings")])
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
 def extractors_keyboard(chat: queries.ChatRow) -> InlineKeyboardMarkup:
-    lang = chat.language
+    return _extractors_keyboard(chat.language, chat.disabled_bits)
+
+
+@lru_cache(maxsize=512)
+def _extractors_keyboard(lang: str, disabled_bits: int) -> InlineKeyboardMarkup:
+    disabled_mark = f" ({t('DisabledButton', lang)})"
     rows = []
     for ex in list_visible_extractors():
-        disabled = ex.id in chat.disabled_extractors
-        mark = f" ({t('DisabledButton', lang)})" if disabled else ""
-        rows.append([InlineKeyboardButton(text=f"{ex.display_name}{mark}", callback_data=f"settings.extractor.{ex.id}")])
+        mark = disabled_mark if disabled_bits & ex.mask else ""
+        rows.append([InlineKeyboardButton(text=f"{ex.display_name}{mark}", callback_data=SettingsCallback(section="extractor", action=ex.id).pack())])
     rows.append([InlineKeyboardButton(text=t("BackButton", lang), callback_data="settings")])
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
@@ -219,26 +269,25 @@ async def cb_settings(call: CallbackQuery) -> None:
     await call.answer()
 
 
-@router.callback_query(F.data.startswith("settings.toggle."))
-async def cb_toggle(call: CallbackQuery) -> None:
+@router.callback_query(SettingsCallback.filter(F.section == "toggle"))
+async def cb_toggle(call: CallbackQuery, callback_data: SettingsCallback) -> None:
     chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
-    action = call.data.split(".", 2)[2]
+    action = callback_data.action
 
     if action == "captions":
-        await queries.toggle_chat_captions(chat.chat_id)
+        chat = await queries.toggle_chat_captions(chat.chat_id)
     elif action == "silent":
-        await queries.toggle_chat_silent(chat.chat_id)
+        chat = await queries.toggle_chat_silent(chat.chat_id)
     elif action == "nsfw":
-        await queries.toggle_chat_nsfw(chat.chat_id)
+        chat = await queries.toggle_chat_nsfw(chat.chat_id)
     elif action == "delete_links":
-        await queries.toggle_chat_delete_links(chat.chat_id)
+        chat = await queries.toggle_chat_delete_links(chat.chat_id)
 
-    chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
     await call.message.edit_reply_markup(reply_markup=settings_keyboard(chat))
     await call.answer()
 
 
-@router.callback_query(F.data == "settings.select.language")
+@router.callback_query(SettingsCallback.filter((F.section == "select") & (F.action == "language")))
 async def cb_select_language(call: CallbackQuery) -> None:
     chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
     await call.message.edit_text(
@@ -249,12 +298,11 @@ async def cb_select_language(call: CallbackQuery) -> None:
     await call.answer()
 
 
-@router.callback_query(F.data.startswith("settings.language."))
-async def cb_language(call: CallbackQuery) -> None:
-    chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
-    lang = call.data.split(".", 2)[2]
-    await queries.set_chat_language(chat.chat_id, lang)
+@router.callback_query(SettingsCallback.filter(F.section == "language"))
+async def cb_language(call: CallbackQuery, callback_data: SettingsCallback) -> None:
     chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
+    lang = callback_data.action
+    chat = await queries.set_chat_language(chat.chat_id, lang)
     await call.message.edit_text(
         t("GroupSettingsMessage" if chat.type == "group" else "PrivateSettingsMessage", chat.language),
         parse_mode=ParseMode.HTML,
@@ -264,7 +312,7 @@ async def cb_language(call: CallbackQuery) -> None:
     await call.answer()
 
 
-@router.callback_query(F.data == "settings.select.album_limit")
+@router.callback_query(SettingsCallback.filter((F.section == "select") & (F.action == "album_limit")))
 async def cb_album_limit(call: CallbackQuery) -> None:
     chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
     await call.message.edit_text(
@@ -275,10 +323,10 @@ async def cb_album_limit(call: CallbackQuery) -> None:
     await call.answer()
 
 
-@router.callback_query(F.data.startswith("settings.album."))
-async def cb_album_set(call: CallbackQuery) -> None:
+@router.callback_query(SettingsCallback.filter(F.section == "album"))
+async def cb_album_set(call: CallbackQuery, callback_data: SettingsCallback) -> None:
     chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
-    n = int(call.data.split(".", 2)[2])
+    n = int(callback_data.action)
     if n < 1 or n > 20:
         await call.answer()
         return
@@ -286,8 +334,7 @@ async def cb_album_set(call: CallbackQuery) -> None:
     if n > settings.DEFAULT_MEDIA_ALBUM_LIMIT and settings.DEFAULT_MEDIA_ALBUM_LIMIT > 0:
         # Instance-wide hard cap equals DEFAULT_MEDIA_ALBUM_LIMIT to mirror Go's range guard.
         n = settings.DEFAULT_MEDIA_ALBUM_LIMIT
-    await queries.set_chat_media_album_limit(chat.chat_id, n)
-    chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
+    chat = await queries.set_chat_media_album_limit(chat.chat_id, n)
     await call.message.edit_text(
         t("GroupSettingsMessage" if chat.type == "group" else "PrivateSettingsMessage", chat.language),
         parse_mode=ParseMode.HTML,
@@ -297,7 +344,7 @@ async def cb_album_set(call: CallbackQuery) -> None:
     await call.answer()
 
 
-@router.callback_query(F.data == "settings.select.disabled_extractors")
+@router.callback_query(SettingsCallback.filter((F.section == "select") & (F.action == "disabled_extractors")))
 async def cb_disabled_extractors(call: CallbackQuery) -> None:
     chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
     await call.message.edit_text(
@@ -308,15 +355,17 @@ async def cb_disabled_extractors(call: CallbackQuery) -> None:
     await call.answer()
 
 
-@router.callback_query(F.data.startswith("settings.extractor."))
-async def cb_toggle_extractor(call: CallbackQuery) -> None:
+@router.callback_query(SettingsCallback.filter(F.section == "extractor"))
+async def cb_toggle_extractor(call: CallbackQuery, callback_data: SettingsCallback) -> None:
     chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
-    ex_id = call.data.split(".", 2)[2]
-    if ex_id in chat.disabled_extractors:
-        await queries.remove_disabled_extractor(chat.chat_id, ex_id)
+    ex = get_extractor(callback_data.action)
+    if ex is None:
+        await call.answer()
+        return
+    if chat.disabled_bits & ex.mask:
+        chat = await queries.remove_disabled_extractor(chat.chat_id, ex.id)
     else:
-        await queries.add_disabled_extractor(chat.chat_id, ex_id)
-    chat = await queries.get_or_create_chat(call.message.chat.id, _chat_type_str(call.message))
+        chat = await queries.add_disabled_extractor(chat.chat_id, ex.id)
     await call.message.edit_reply_markup(reply_markup=extractors_keyboard(chat))
     await call.answer()
 
@@ -364,10 +413,134 @@ async def cmd_derr(message: Message) -> None:
 
 
 def _extract_urls(message: Message) -> List[str]:
-    urls: List[str] = []
+    """Unique links in the message text, in order of appearance."""
     text = message.text or message.caption or ""
-    urls.extend(URL_RE.findall(text))
-    return urls
+    # most messages carry no link at all; skip the regex for those
+    if "://" not in text:
+        return []
+    return list(dict.fromkeys(m.group(0).rstrip(").,;:!?") for m in URL_RE.finditer(text)))
+
+
+def _error_id(e: Exception) -> str:
+    # store hashed error like govd (short id); 8 hex chars fits errors.id
+    return hashlib.blake2b(str(e).encode("utf-8"), digest_size=4).hexdigest()
+
+
+def _sent_file_id(sent: Message) -> str:
+    """Telegram's file_id for a file we just sent (it may come back as a video/animation)."""
+    media = sent.document or sent.video or sent.animation or sent.audio
+    return media.file_id if media else ""
+
+
+async def _process_url(message: Message, chat: queries.ChatRow, url: str, ex: Extractor) -> bool:
+    """Download and send a single link. Returns True once the link was handled."""
+    lang = chat.language
+
+    try:
+        processing = await message.reply(t("ProcessingMessage", lang), disable_web_page_preview=True)
+    except Exception:
+        processing = None
+
+    final_url = url
+    if ex.redirect:
+        try:
+            final_url = await resolve_redirect(url)
+        except Exception:
+            final_url = url
+
+    # Download
+    try:
+        res = await download(final_url, max_items=chat.media_album_limit)
+    except Exception as e:
+        err_id = _error_id(e)
+        writer.log_error(err_id, repr(e))
+        if processing:
+            await processing.edit_text(t("ErrorMessage", lang) + f"\n\nid: <code>{err_id}</code>", parse_mode=ParseMode.HTML)
+        else:
+            await message.reply(t("ErrorMessage", lang) + f"\n\nid: {err_id}")
+        return False
+
+    caption = ""
+    if chat.captions:
+        # mirror govd captions header/description templates (best-effort)
+        caption = f"<b>{res.title}</b>"
+        if res.uploader:
+            caption += f"\n@{res.uploader}" if not res.uploader.startswith("@") else f"\n{res.uploader}"
+        if res.description:
+            caption += f"\n\n{res.description[:900]}"
+
+    # Send files (album if >1)
+    try:
+        file_ids: List[str] = []
+        if len(res.files) == 1:
+            f = res.files[0]
+            sent = await message.answer_document(
+                FSInputFile(f.path, filename=os.path.basename(f.path)),
+                caption=caption if caption else None,
+                parse_mode=ParseMode.HTML,
+                disable_notification=chat.silent,
+            )
+            file_ids.append(_sent_file_id(sent))
+        else:
+            # Send as document albums, chunked to respect telegram limits
+            for start in range(0, len(res.files), MEDIA_GROUP_SIZE):
+                chunk = res.files[start:start + MEDIA_GROUP_SIZE]
+                chunk_caption = caption if (caption and start == 0) else None
+                if len(chunk) == 1:
+                    # media groups need at least two items
+                    sent = await message.answer_document(
+                        FSInputFile(chunk[0].path, filename=os.path.basename(chunk[0].path)),
+                        caption=chunk_caption,
+                        parse_mode=ParseMode.HTML,
+                        disable_notification=chat.silent,
+                    )
+                    file_ids.append(_sent_file_id(sent))
+                    continue
+                sent_group = await message.answer_media_group(
+                    [
+                        InputMediaDocument(
+                            media=FSInputFile(f.path, filename=os.path.basename(f.path)),
+                            caption=chunk_caption if i == 0 else None,
+                            parse_mode=ParseMode.HTML,
+                        )
+                        for i, f in enumerate(chunk)
+                    ],
+                    disable_notification=chat.silent,
+                )
+                file_ids.extend(_sent_file_id(m) for m in sent_group)
+
+        writer.insert_download(
+            content_id=res.content_id,
+            content_url=final_url,
+            extractor_id=res.extractor_id,
+            formats=[
+                {
+                    "file_id": file_id,
+                    "media_type": f.media_type,
+                    "audio_codec": f.audio_codec,
+                    "video_codec": f.video_codec,
+                    "file_size": f.file_size,
+                    "duration": f.duration,
+                    "width": f.width,
+                    "height": f.height,
+                    "bitrate": f.bitrate,
+                }
+                for f, file_id in zip(res.files, file_ids)
+            ],
+        )
+
+    except Exception as e:
+        err_id = _error_id(e)
+        writer.log_error(err_id, repr(e))
+        await message.reply(t("ErrorMessage", lang) + f"\n\nid: <code>{err_id}</code>", parse_mode=ParseMode.HTML)
+
+    if processing:
+        try:
+            await processing.delete()
+        except Exception:
+            pass
+
+    return True
 
 
 @router.message(F.text | F.caption)
@@ -377,119 +550,35 @@ async def url_handler(message: Message) -> None:
     if not _is_whitelisted(message.from_user.id):
         return
 
-    urls = _extract_urls(message)
-    if not urls:
+    # Resolve extractors before touching the DB: most chatter in groups has
+    # no supported link and shouldn't cost a chat lookup.
+    matches = [(url, ex) for url in _extract_urls(message) if (ex := match_extractor(url))]
+    if not matches:
         return
 
     chat = await queries.get_or_create_chat(message.chat.id, _chat_type_str(message))
-    lang = chat.language
+    matches = [(url, ex) for url, ex in matches if not chat.disabled_bits & ex.mask]
+    if not matches:
+        return
 
-    for url in urls:
-        ex = match_extractor(url)
-        if not ex:
-            continue
-        if ex.id in chat.disabled_extractors:
-            continue
+    # Links in the same message are downloaded in parallel, a few at a time.
+    sem = asyncio.Semaphore(MAX_PARALLEL_URLS)
 
-        try:
-            processing = await message.reply(t("ProcessingMessage", lang), disable_web_page_preview=True)
-        except Exception:
-            processing = None
+    async def handle_one(url: str, ex: Extractor) -> bool:
+        async with sem:
+            return await _process_url(message, chat, url, ex)
 
-        final_url = url
-        if ex.redirect:
-            try:
-                final_url = await resolve_redirect(url)
-            except Exception:
-                final_url = url
+    results = await asyncio.gather(*(handle_one(url, ex) for url, ex in matches), return_exceptions=True)
+    for r in results:
+        if isinstance(r, Exception):
+            log.error("failed to process link: %r", r)
 
-        # Download
-        try:
-            res = await download(final_url, max_items=chat.media_album_limit)
-        except Exception as e:
-            # store hashed error like govd (short id)
-            err_id = hashlib.sha256(str(e).encode("utf-8")).hexdigest()[:16]
-            await queries.log_error(err_id, repr(e))
-            if processing:
-                await processing.edit_text(t("ErrorMessage", lang) + f"\n\nid: <code>{err_id}</code>", parse_mode=ParseMode.HTML)
-            else:
-                await message.reply(t("ErrorMessage", lang) + f"\n\nid: {err_id}")
-            continue
-
-        caption = ""
-        if chat.captions:
-            # mirror govd captions header/description templates (best-effort)
-            caption = f"<b>{res.title}</b>"
-            if res.uploader:
-                caption += f"\n@{res.uploader}" if not res.uploader.startswith("@") else f"\n{res.uploader}"
-            if res.description:
-                caption += f"\n\n{res.description[:900]}"
-
-        # Send files (album if >1)
+    # Delete original link message if enabled
+    if chat.delete_links and any(r is True for r in results):
         try:
-            if len(res.files) == 1:
-                f = res.files[0]
-                await message.answer_document(
-                    InputFile(f.path),
-                    caption=caption if caption else None,
-                    parse_mode=ParseMode.HTML,
-                    disable_notification=chat.silent,
-                )
-                await queries.insert_download(
-                    content_id=res.content_id,
-                    content_url=final_url,
-                    extractor_id=res.extractor_id,
-                    chat_id=chat.chat_id,
-                    media_type=f.media_type,
-                    audio_codec=f.audio_codec,
-                    video_codec=f.video_codec,
-                    file_size=f.file_size,
-                    duration=f.duration,
-                    width=f.width,
-                    height=f.height,
-                    bitrate=f.bitrate,
-                )
-            else:
-                # Send as documents in multiple messages to respect telegram limits
-                for i, f in enumerate(res.files):
-                    await message.answer_document(
-                        InputFile(f.path),
-                        caption=caption if (caption and i == 0) else None,
-                        parse_mode=ParseMode.HTML,
-                        disable_notification=chat.silent,
-                    )
-                    await queries.insert_download(
-                        content_id=res.content_id,
-                        content_url=final_url,
-                        extractor_id=res.extractor_id,
-                        chat_id=chat.chat_id,
-                        media_type=f.media_type,
-                        audio_codec=f.audio_codec,
-                        video_codec=f.video_codec,
-                        file_size=f.file_size,
-                        duration=f.duration,
-                        width=f.width,
-                        height=f.height,
-                        bitrate=f.bitrate,
-                    )
-
-        except Exception as e:
-            err_id = hashlib.sha256(str(e).encode("utf-8")).hexdigest()[:16]
-            await queries.log_error(err_id, repr(e))
-            await message.reply(t("ErrorMessage", lang) + f"\n\nid: <code>{err_id}</code>", parse_mode=ParseMode.HTML)
-
-        # Delete original link message if enabled
-        if chat.delete_links:
-            try:
-                await message.delete()
-            except Exception:
-                pass
-
-        if processing:
-            try:
-                await processing.delete()
-            except Exception:
-                pass
+            await message.delete()
+        except Exception:
+            pass
 
 
 # Inline mode (best-effort parity with govd)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+import signal
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from app.config.settings import settings
+from app.utils.logging import get_logger
+
+log = get_logger(__name__)
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher) -> None:
+    """Serve updates pushed by Telegram instead of long-polling for them."""
+    await bot.set_webhook(
+        settings.WEBHOOK_URL.rstrip("/") + settings.WEBHOOK_PATH,
+        secret_token=settings.WEBHOOK_SECRET,
+        max_connections=settings.CONCURRENT_UPDATES,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=settings.WEBHOOK_SECRET,
+    ).register(app, path=settings.WEBHOOK_PATH)
+    # wires dispatcher startup/shutdown hooks to the aiohttp app lifecycle
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host="0.0.0.0", port=settings.WEBHOOK_PORT).start()
+    log.info("webhook server started on :%d%s", settings.WEBHOOK_PORT, settings.WEBHOOK_PATH)
+
+    # start_polling installs these handlers itself; here nobody else does, and
+    # as PID 1 in the container an unhandled SIGTERM would end in SIGKILL.
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await stop.wait()
+        log.info("stopping bot webhook")
+    finally:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(sig)
+        # emits dp.shutdown (flushing the writer) via setup_application
+        await runner.cleanup()
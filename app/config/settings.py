@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -20,6 +20,13 @@ class Settings(BaseSettings):
     BOT_TOKEN: str = Field(...)
     BOT_API_URL: str = "https://api.telegram.org"  # kept for parity; aiogram uses base api server
     CONCURRENT_UPDATES: int = 32
+    REDIS_URL: Optional[str] = None  # FSM storage shared by all workers; in-memory if unset
+
+    # Webhook (polling is used when WEBHOOK_URL is unset)
+    WEBHOOK_URL: Optional[str] = None  # public base URL Telegram will POST updates to
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_SECRET: Optional[str] = None
 
     # Runtime
     DOWNLOADS_DIR: str = "downloads"
@@ -39,6 +46,8 @@ class Settings(BaseSettings):
 
     # Features
     CACHING: bool = True
+    CHAT_CACHE_SIZE: int = 50_000  # chats kept in the per-process settings cache
+    CHAT_CACHE_TTL: int = 300  # seconds
 
     CAPTIONS_HEADER: str = "<a href='{{url}}'>source</a> - @{{username}}"
     CAPTIONS_DESCRIPTION: str = "<blockquote expandable>{{text}}</blockquote>"
@@ -60,3 +69,7 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
+
+# Access lists are checked on every update; build them once.
+ADMIN_IDS: FrozenSet[int] = frozenset(settings.ADMINS or ())
+WHITELIST_IDS: FrozenSet[int] = frozenset(settings.WHITELIST or ())
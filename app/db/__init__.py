@@ -1,3 +1,3 @@
-from app.db import queries
+from app.db import queries, writer
 
-__all__ = ["queries"]
+__all__ = ["queries", "writer"]
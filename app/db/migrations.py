@@ -11,40 +11,52 @@ log = get_logger(__name__)
 
 MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
 
+# Advisory lock key shared by every bot process, so replicas starting at the
+# same time don't apply the same migration twice.
+MIGRATIONS_LOCK_ID = 727274
+
+
+def _up_section(sql: str) -> str:
+    """Returns the `-- +goose Up` part of a goose migration file."""
+    return sql.partition("-- +goose Down")[0]
+
 
 async def run_migrations() -> None:
     """Runs SQL migrations in lexical order, idempotently."""
     p = pool()
     async with p.acquire() as conn:
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS schema_migrations (
-                filename TEXT PRIMARY KEY,
-                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
-            );
-            """
-        )
-
-        applied = {
-            r["filename"]
-            for r in await conn.fetch("SELECT filename FROM schema_migrations")
-        }
-
-        files = sorted([f for f in MIGRATIONS_DIR.glob("*.sql")])
-        if not files:
-            log.warning("no migrations found in %s", MIGRATIONS_DIR)
-            return
-
-        for f in files:
-            if f.name in applied:
-                continue
-
-            sql = f.read_text(encoding="utf-8")
-            log.info("applying migration %s", f.name)
+        await conn.execute("SELECT pg_advisory_lock($1)", MIGRATIONS_LOCK_ID)
+        try:
+            await conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    filename TEXT PRIMARY KEY,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                );
+                """
+            )
+
+            applied = set(
+                await conn.fetchval("SELECT array_agg(filename) FROM schema_migrations") or ()
+            )
+
+            files = sorted([f for f in MIGRATIONS_DIR.glob("*.sql")])
+            if not files:
+                log.warning("no migrations found in %s", MIGRATIONS_DIR)
+                return
+
             async with conn.transaction():
-                await conn.execute(sql)
-                await conn.execute(
-                    "INSERT INTO schema_migrations (filename) VALUES ($1)", f.name
-                )
+                for f in files:
+                    if f.name in applied:
+                        continue
+
+                    sql = _up_section(f.read_text(encoding="utf-8"))
+                    log.info("applying migration %s", f.name)
+                    await conn.execute(sql)
+                    await conn.execute(
+                        "INSERT INTO schema_migrations (filename) VALUES ($1)", f.name
+                    )
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATIONS_LOCK_ID)
 
         log.info("migrations up to date")
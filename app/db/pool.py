@@ -1,21 +1,38 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
 import asyncpg
 
+from app.config.settings import settings
 from app.utils.logging import get_logger
 
 log = get_logger(__name__)
 
 _pool: asyncpg.Pool | None = None
+_listener: asyncpg.Connection | None = None
+# channel -> (notification callback, called after the listener reconnects)
+_listeners: Dict[str, Tuple[Callable[..., Any], Optional[Callable[[], Any]]]] = {}
+_reconnect_task: asyncio.Task | None = None
+
+LISTEN_RETRY_DELAY = 5.0
 
 
 def _dsn() -> str:
-    # Render sets DATABASE_URL as an environment variable
-    dsn = os.getenv("DATABASE_URL")
-    if not dsn or not dsn.strip():
-        raise RuntimeError("Missing required env var: DATABASE_URL")
-    return dsn.strip()
+    # Render sets DATABASE_URL as an environment variable; otherwise build the
+    # DSN from the DB_* settings (docker-compose / local runs).
+    dsn = (os.getenv("DATABASE_URL") or "").strip()
+    return dsn or settings.db_dsn
+
+
+def _ssl(dsn: str) -> str | bool:
+    # Render's external hostnames require TLS; its internal Postgres and
+    # local/docker databases don't speak it.
+    if dsn.startswith("postgresql://") and "render" in dsn:
+        return "require"
+    return False
 
 
 async def init_pool() -> asyncpg.Pool:
@@ -27,9 +44,19 @@ async def init_pool() -> asyncpg.Pool:
 
     log.info("DB: connecting")
 
+    dsn = _dsn()
+    # Keep a warm baseline of connections so bursts of updates don't pay the
+    # connect/auth handshake, and recycle ones that sit idle for long.
     _pool = await asyncpg.create_pool(
-        dsn=_dsn(),
-        ssl=False,  # REQUIRED for Render internal Postgres
+        dsn=dsn,
+        ssl=_ssl(dsn),
+        min_size=min(settings.CONCURRENT_UPDATES, 8),
+        max_size=max(16, settings.CONCURRENT_UPDATES * 2),
+        max_inactive_connection_lifetime=300,
+        # asyncpg prepares each distinct query once per connection and keeps
+        # it across pool releases; every query here is static SQL text.
+        statement_cache_size=1024,
+        command_timeout=60,
     )
 
     log.info("DB: pool ready")
@@ -42,8 +69,76 @@ def pool() -> asyncpg.Pool:
     return _pool
 
 
+async def _connect_listener() -> asyncpg.Connection:
+    dsn = _dsn()
+    conn = await asyncpg.connect(dsn=dsn, ssl=_ssl(dsn))
+    conn.add_termination_listener(_on_listener_terminated)
+    return conn
+
+
+def _on_listener_terminated(conn: asyncpg.Connection) -> None:
+    global _reconnect_task, _listener
+    # close_pool() detaches the listener before closing it on purpose
+    if conn is not _listener:
+        return
+    _listener = None
+    log.warning("DB: listener connection lost, reconnecting")
+    _reconnect_task = asyncio.get_running_loop().create_task(_reconnect_listener())
+
+
+async def _reconnect_listener() -> None:
+    global _listener
+    while True:
+        conn = None
+        try:
+            conn = await _connect_listener()
+            for channel, (callback, _) in _listeners.items():
+                await conn.add_listener(channel, callback)
+        except Exception as e:
+            log.warning("DB: listener reconnect failed: %s", e)
+            if conn is not None:
+                conn.terminate()
+            await asyncio.sleep(LISTEN_RETRY_DELAY)
+            continue
+        _listener = conn
+        break
+
+    log.info("DB: listener reconnected")
+    # notifications sent while disconnected are lost; let subscribers resync
+    for _, on_reconnect in _listeners.values():
+        if on_reconnect is not None:
+            on_reconnect()
+
+
+async def listen(
+    channel: str,
+    callback: Callable[..., Any],
+    on_reconnect: Optional[Callable[[], Any]] = None,
+) -> None:
+    """LISTEN on `channel` using a dedicated connection outside the pool.
+
+    The connection is re-established if it drops; `on_reconnect` is then
+    called, since notifications sent in the meantime were missed.
+    """
+    global _listener
+
+    if _listener is None:
+        _listener = await _connect_listener()
+
+    await _listener.add_listener(channel, callback)
+    _listeners[channel] = (callback, on_reconnect)
+    log.info("DB: listening on %s", channel)
+
+
 async def close_pool() -> None:
-    global _pool
+    global _pool, _listener, _reconnect_task
+    if _reconnect_task is not None:
+        _reconnect_task.cancel()
+        _reconnect_task = None
+    _listeners.clear()
+    if _listener is not None:
+        listener, _listener = _listener, None
+        await listener.close()
     if _pool is not None:
         await _pool.close()
         _pool = None
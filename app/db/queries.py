@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Tuple, Union
 
 import asyncpg
+from asyncpg.pool import PoolConnectionProxy
 
 from app.config.settings import settings
-from app.db.pool import pool
+from app.db.pool import listen, pool
+from app.extractors.registry import extractor_ids, get_extractor
 
 
 @dataclass
@@ -19,62 +27,161 @@ class ChatRow:
     captions: bool
     silent: bool
     language: str
-    disabled_extractors: List[str]
+    # Extractor.mask bits of the extractors disabled in this chat
+    disabled_bits: int
     delete_links: bool
 
+    @cached_property
+    def disabled_extractors(self) -> FrozenSet[str]:
+        return extractor_ids(self.disabled_bits)
+
+
+# Chat settings change rarely but are read on every update, so keep the most
+# recently used rows in-process for a short while. Mutations refresh the entry
+# and NOTIFY other processes so they can drop their copy.
+_CHAT_INVALIDATE_CHANNEL = "chat_invalidate"
+# Tags this process's NOTIFY payloads ('<chat_id>:<instance>') so it can skip
+# its own: the writer has already refreshed its cache entry.
+_INSTANCE_ID = uuid.uuid4().hex
+
+_chat_cache: "OrderedDict[int, Tuple[ChatRow, float]]" = OrderedDict()
+# One loader per chat: concurrent misses for the same chat wait for the first.
+_chat_locks: Dict[int, asyncio.Lock] = {}
+# chat_id -> [version, loads in flight]. Writes and invalidations bump the
+# version of chats being loaded, so a load that read the row before a
+# concurrent update doesn't cache the stale copy.
+_chat_loads: Dict[int, List[int]] = {}
+
+
+def _cache_get(chat_id: int) -> Optional[ChatRow]:
+    if not settings.CACHING:
+        return None
+    entry = _chat_cache.get(chat_id)
+    if entry is None:
+        return None
+    chat, expires_at = entry
+    if expires_at <= time.monotonic():
+        del _chat_cache[chat_id]
+        return None
+    _chat_cache.move_to_end(chat_id)
+    return chat
+
+
+def _cache_put(chat: ChatRow) -> None:
+    if not settings.CACHING:
+        return
+    _chat_cache[chat.chat_id] = (chat, time.monotonic() + settings.CHAT_CACHE_TTL)
+    _chat_cache.move_to_end(chat.chat_id)
+    if len(_chat_cache) > settings.CHAT_CACHE_SIZE:
+        _chat_cache.popitem(last=False)
+
+
+def _bump_version(chat_id: int) -> None:
+    load = _chat_loads.get(chat_id)
+    if load is not None:
+        load[0] += 1
+
+
+def invalidate_chat(chat_id: int) -> None:
+    """Forget the cached settings of a chat; the next read goes to the DB."""
+    _bump_version(chat_id)
+    _chat_cache.pop(chat_id, None)
+
+
+def _on_chat_invalidate(conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+    chat_id, _, origin = payload.partition(":")
+    if origin == _INSTANCE_ID:
+        return
+    invalidate_chat(int(chat_id))
+
+
+async def listen_chat_invalidations() -> None:
+    """Drop cached chats when another process changes their settings."""
+    await listen(_CHAT_INVALIDATE_CHANNEL, _on_chat_invalidate, on_reconnect=_chat_cache.clear)
+
+
+# Columns making up a ChatRow, selected from `chat c JOIN settings s`.
+_CHAT_COLUMNS = """
+    c.chat_id,
+    c.type,
+    s.nsfw,
+    s.media_album_limit,
+    s.captions,
+    s.silent,
+    s.language,
+    s.disabled_extractors_mask,
+    s.delete_links
+"""
+
+_NOTIFY_CHAT = f"pg_notify('{_CHAT_INVALIDATE_CHANNEL}', c.chat_id::text || ':{_INSTANCE_ID}')"
+
+
+def _update_settings_sql(assignments: str) -> str:
+    # Settings mutations return the updated ChatRow so callers don't have to
+    # re-fetch the chat after every change.
+    return f"""
+        UPDATE settings s
+        SET {assignments}, updated_at = CURRENT_TIMESTAMP
+        FROM chat c
+        WHERE s.chat_id = $1 AND c.chat_id = s.chat_id
+        RETURNING {_CHAT_COLUMNS}, {_NOTIFY_CHAT};
+    """
 
-async def get_or_create_chat(chat_id: int, chat_type: str) -> ChatRow:
-    p = pool()
-    async with p.acquire() as conn:
-        row = await conn.fetchrow(
-            """
-            WITH upsert_chat AS (
-                INSERT INTO chat (chat_id, type)
-                VALUES ($1, $2)
-                ON CONFLICT (chat_id) DO NOTHING
-                RETURNING *
-            ),
-            upsert_settings AS (
-                INSERT INTO settings (chat_id, language, captions, silent, nsfw, media_album_limit, delete_links)
-                VALUES ($1, $3, $4, $5, $6, $7, $8)
-                ON CONFLICT (chat_id) DO UPDATE SET
-                    language = CASE
-                        WHEN settings.language = 'XX' THEN EXCLUDED.language
-                        ELSE settings.language
-                    END
-                RETURNING *
-            ),
-            final_chat AS (
-                SELECT * FROM upsert_chat
-                UNION ALL
-                SELECT * FROM chat WHERE chat_id = $1 AND NOT EXISTS (SELECT 1 FROM upsert_chat)
-            ),
-            final_settings AS (
-                SELECT * FROM upsert_settings
-            )
-            SELECT
-                c.chat_id,
-                c.type,
-                s.nsfw,
-                s.media_album_limit,
-                s.captions,
-                s.silent,
-                s.language,
-                s.disabled_extractors,
-                s.delete_links
-            FROM final_chat c
-            JOIN final_settings s ON s.chat_id = c.chat_id;
-            """,
-            chat_id,
-            chat_type,
-            settings.DEFAULT_LANGUAGE,
-            settings.DEFAULT_ENABLE_CAPTIONS,
-            settings.DEFAULT_ENABLE_SILENT,
-            settings.DEFAULT_ENABLE_NSFW,
-            settings.DEFAULT_MEDIA_ALBUM_LIMIT,
-            settings.DEFAULT_DELETE_LINKS,
-        )
 
+_SET_LANGUAGE_SQL = _update_settings_sql("language = $2")
+_TOGGLE_CAPTIONS_SQL = _update_settings_sql("captions = NOT captions")
+_TOGGLE_NSFW_SQL = _update_settings_sql("nsfw = NOT nsfw")
+_TOGGLE_SILENT_SQL = _update_settings_sql("silent = NOT silent")
+_TOGGLE_DELETE_LINKS_SQL = _update_settings_sql("delete_links = NOT delete_links")
+_SET_MEDIA_ALBUM_LIMIT_SQL = _update_settings_sql("media_album_limit = $2")
+
+# $2 is the extractor's Extractor.mask
+_ADD_DISABLED_EXTRACTOR_SQL = _update_settings_sql(
+    "disabled_extractors_mask = disabled_extractors_mask | $2::BIGINT"
+)
+_REMOVE_DISABLED_EXTRACTOR_SQL = _update_settings_sql(
+    "disabled_extractors_mask = disabled_extractors_mask & ~($2::BIGINT)"
+)
+
+_SELECT_CHAT_SQL = f"""
+    SELECT {_CHAT_COLUMNS}
+    FROM chat c
+    JOIN settings s ON s.chat_id = c.chat_id
+    WHERE c.chat_id = $1;
+"""
+
+_GET_OR_CREATE_CHAT_SQL = f"""
+    WITH upsert_chat AS (
+        INSERT INTO chat (chat_id, type)
+        VALUES ($1, $2)
+        ON CONFLICT (chat_id) DO NOTHING
+        RETURNING *
+    ),
+    upsert_settings AS (
+        INSERT INTO settings (chat_id, language, captions, silent, nsfw, media_album_limit, delete_links)
+        VALUES ($1, $3, $4, $5, $6, $7, $8)
+        ON CONFLICT (chat_id) DO UPDATE SET
+            language = CASE
+                WHEN settings.language = 'XX' THEN EXCLUDED.language
+                ELSE settings.language
+            END
+        RETURNING *
+    ),
+    final_chat AS (
+        SELECT * FROM upsert_chat
+        UNION ALL
+        SELECT * FROM chat WHERE chat_id = $1 AND NOT EXISTS (SELECT 1 FROM upsert_chat)
+    ),
+    final_settings AS (
+        SELECT * FROM upsert_settings
+    )
+    SELECT {_CHAT_COLUMNS}
+    FROM final_chat c
+    JOIN final_settings s ON s.chat_id = c.chat_id;
+"""
+
+
+def _chat_row(row: asyncpg.Record) -> ChatRow:
     return ChatRow(
         chat_id=row["chat_id"],
         type=row["type"],
@@ -83,100 +190,167 @@ async def get_or_create_chat(chat_id: int, chat_type: str) -> ChatRow:
         captions=row["captions"],
         silent=row["silent"],
         language=row["language"],
-        disabled_extractors=list(row["disabled_extractors"] or []),
+        disabled_bits=row["disabled_extractors_mask"],
         delete_links=row["delete_links"],
     )
 
 
-async def set_chat_language(chat_id: int, language: str) -> None:
-    async with pool().acquire() as conn:
-        await conn.execute(
-            "UPDATE settings SET language = $1, updated_at = CURRENT_TIMESTAMP WHERE chat_id = $2",
-            language,
-            chat_id,
-        )
+# What callers may pass as `conn`: a plain connection, or one held from pool().
+Conn = Union[asyncpg.Connection, PoolConnectionProxy]
 
 
-async def toggle_chat_captions(chat_id: int) -> None:
-    async with pool().acquire() as conn:
-        await conn.execute(
-            "UPDATE settings SET captions = NOT captions, updated_at = CURRENT_TIMESTAMP WHERE chat_id = $1",
-            chat_id,
-        )
+@asynccontextmanager
+async def _acquire(conn: Optional[Conn] = None) -> AsyncIterator[Conn]:
+    """Yield ``conn`` if the caller already holds one, else borrow from the pool."""
+    if conn is not None:
+        yield conn
+        return
+    async with pool().acquire() as acquired:
+        yield acquired
 
 
-async def toggle_chat_nsfw(chat_id: int) -> None:
-    async with pool().acquire() as conn:
-        await conn.execute(
-            "UPDATE settings SET nsfw = NOT nsfw, updated_at = CURRENT_TIMESTAMP WHERE chat_id = $1",
-            chat_id,
-        )
+async def _update_chat(
+    sql: str,
+    chat_id: int,
+    *args: Any,
+    conn: Optional[Conn] = None,
+) -> ChatRow:
+    async with _acquire(conn) as c:
+        row = await c.fetchrow(sql, chat_id, *args)
+    if row is None:
+        raise RuntimeError(f"chat {chat_id} not found")
+    chat = _chat_row(row)
+    _bump_version(chat_id)
+    _cache_put(chat)
+    return chat
 
 
-async def toggle_chat_silent(chat_id: int) -> None:
+async def get_or_create_chat(chat_id: int, chat_type: str) -> ChatRow:
+    if not settings.CACHING:
+        return await _fetch_chat(chat_id, chat_type)
+
+    chat = _cache_get(chat_id)
+    if chat is not None:
+        return chat
+
+    lock = _chat_locks.setdefault(chat_id, asyncio.Lock())
+    try:
+        async with lock:
+            chat = _cache_get(chat_id)
+            if chat is None:
+                chat = await _load_chat(chat_id, chat_type)
+            return chat
+    finally:
+        if not lock.locked() and _chat_locks.get(chat_id) is lock:
+            del _chat_locks[chat_id]
+
+
+async def _load_chat(chat_id: int, chat_type: str) -> ChatRow:
+    load = _chat_loads.setdefault(chat_id, [0, 0])
+    load[1] += 1
+    version = load[0]
+    try:
+        chat = await _fetch_chat(chat_id, chat_type)
+    finally:
+        load[1] -= 1
+        if not load[1]:
+            del _chat_loads[chat_id]
+    # a write landed meanwhile; its own put (or the next read) wins
+    if load[0] == version:
+        _cache_put(chat)
+    return chat
+
+
+async def _fetch_chat(chat_id: int, chat_type: str) -> ChatRow:
     async with pool().acquire() as conn:
-        await conn.execute(
-            "UPDATE settings SET silent = NOT silent, updated_at = CURRENT_TIMESTAMP WHERE chat_id = $1",
+        # Existing chats are a plain indexed read; only new chats (or ones
+        # still on the 'XX' placeholder language) need the upsert.
+        row = await conn.fetchrow(_SELECT_CHAT_SQL, chat_id)
+        if row is not None and row["language"] != "XX":
+            return _chat_row(row)
+
+        row = await conn.fetchrow(
+            _GET_OR_CREATE_CHAT_SQL,
             chat_id,
+            chat_type,
+            settings.DEFAULT_LANGUAGE,
+            settings.DEFAULT_ENABLE_CAPTIONS,
+            settings.DEFAULT_ENABLE_SILENT,
+            settings.DEFAULT_ENABLE_NSFW,
+            settings.DEFAULT_MEDIA_ALBUM_LIMIT,
+            settings.DEFAULT_DELETE_LINKS,
         )
+    return _chat_row(row)
 
 
-async def toggle_chat_delete_links(chat_id: int) -> None:
-    async with pool().acquire() as conn:
-        await conn.execute(
-            "UPDATE settings SET delete_links = NOT delete_links, updated_at = CURRENT_TIMESTAMP WHERE chat_id = $1",
-            chat_id,
-        )
+async def set_chat_language(
+    chat_id: int, language: str, *, conn: Optional[Conn] = None
+) -> ChatRow:
+    return await _update_chat(_SET_LANGUAGE_SQL, chat_id, language, conn=conn)
 
 
-async def set_chat_media_album_limit(chat_id: int, limit: int) -> None:
-    async with pool().acquire() as conn:
-        await conn.execute(
-            "UPDATE settings SET media_album_limit = $1, updated_at = CURRENT_TIMESTAMP WHERE chat_id = $2",
-            limit,
-            chat_id,
-        )
+async def toggle_chat_captions(
+    chat_id: int, *, conn: Optional[Conn] = None
+) -> ChatRow:
+    return await _update_chat(_TOGGLE_CAPTIONS_SQL, chat_id, conn=conn)
 
 
-async def add_disabled_extractor(chat_id: int, extractor_id: str) -> None:
-    async with pool().acquire() as conn:
-        await conn.execute(
-            """
-            UPDATE settings
-            SET disabled_extractors = array_append(disabled_extractors, $1), updated_at = CURRENT_TIMESTAMP
-            WHERE chat_id = $2 AND NOT ($1 = ANY(disabled_extractors));
-            """,
-            extractor_id,
-            chat_id,
-        )
+async def toggle_chat_nsfw(
+    chat_id: int, *, conn: Optional[Conn] = None
+) -> ChatRow:
+    return await _update_chat(_TOGGLE_NSFW_SQL, chat_id, conn=conn)
 
 
-async def remove_disabled_extractor(chat_id: int, extractor_id: str) -> None:
-    async with pool().acquire() as conn:
-        await conn.execute(
-            """
-            UPDATE settings
-            SET disabled_extractors = array_remove(disabled_extractors, $1), updated_at = CURRENT_TIMESTAMP
-            WHERE chat_id = $2;
-            """,
-            extractor_id,
-            chat_id,
-        )
+async def toggle_chat_silent(
+    chat_id: int, *, conn: Optional[Conn] = None
+) -> ChatRow:
+    return await _update_chat(_TOGGLE_SILENT_SQL, chat_id, conn=conn)
+
+
+async def toggle_chat_delete_links(
+    chat_id: int, *, conn: Optional[Conn] = None
+) -> ChatRow:
+    return await _update_chat(_TOGGLE_DELETE_LINKS_SQL, chat_id, conn=conn)
+
+
+async def set_chat_media_album_limit(
+    chat_id: int, limit: int, *, conn: Optional[Conn] = None
+) -> ChatRow:
+    return await _update_chat(_SET_MEDIA_ALBUM_LIMIT_SQL, chat_id, limit, conn=conn)
+
+
+def _extractor_mask(extractor_id: str) -> int:
+    ex = get_extractor(extractor_id)
+    if ex is None:
+        raise ValueError(f"unknown extractor: {extractor_id}")
+    return ex.mask
+
+
+async def add_disabled_extractor(
+    chat_id: int, extractor_id: str, *, conn: Optional[Conn] = None
+) -> ChatRow:
+    return await _update_chat(_ADD_DISABLED_EXTRACTOR_SQL, chat_id, _extractor_mask(extractor_id), conn=conn)
+
+
+async def remove_disabled_extractor(
+    chat_id: int, extractor_id: str, *, conn: Optional[Conn] = None
+) -> ChatRow:
+    return await _update_chat(_REMOVE_DISABLED_EXTRACTOR_SQL, chat_id, _extractor_mask(extractor_id), conn=conn)
+
 
+_LOG_ERROR_SQL = """
+    INSERT INTO errors (id, message)
+    VALUES ($1, $2)
+    ON CONFLICT (id) DO UPDATE
+    SET occurrences = errors.occurrences + 1,
+        last_seen = NOW();
+"""
 
-async def log_error(error_id: str, message: str) -> None:
+
+async def insert_errors_bulk(errors: List[Tuple[str, str]]) -> None:
+    """Record a batch of (error_id, message) pairs in one round-trip."""
     async with pool().acquire() as conn:
-        await conn.execute(
-            """
-            INSERT INTO errors (id, message)
-            VALUES ($1, $2)
-            ON CONFLICT (id) DO UPDATE
-            SET occurrences = errors.occurrences + 1,
-                last_seen = NOW();
-            """,
-            error_id,
-            message,
-        )
+        await conn.executemany(_LOG_ERROR_SQL, errors)
 
 
 async def get_error_by_id(error_id: str) -> Optional[str]:
@@ -188,107 +362,173 @@ async def get_error_by_id(error_id: str) -> Optional[str]:
     return None if row is None else row["message"]
 
 
+_CHAT_STATS_SQL = """
+    SELECT c.type::TEXT AS type, s.language, COUNT(*) AS count
+    FROM chat c
+    JOIN settings s ON s.chat_id = c.chat_id
+    WHERE c.created_at >= $1::TIMESTAMPTZ
+    GROUP BY c.type, s.language;
+"""
+
+_DOWNLOAD_STATS_SQL = """
+    SELECT COUNT(*) AS total_downloads, COALESCE(SUM(mf.file_size), 0)::BIGINT AS total_size
+    FROM media m
+    JOIN media_item mi ON mi.media_id = m.id
+    JOIN media_format mf ON mf.item_id = mi.id
+    WHERE m.created_at >= $1::TIMESTAMPTZ;
+"""
+
+
+# Stats don't need sub-minute freshness; keep each window's result briefly.
+_STATS_CACHE_TTL = 60.0
+_stats_cache: Dict[int, Tuple[Dict[str, Any], float]] = {}
+
+
 async def get_stats(days: int = 7) -> Dict[str, Any]:
-    since_date = datetime.now(tz=timezone.utc) - timedelta(days=days)
-    async with pool().acquire() as conn:
-        row = await conn.fetchrow(
-            """
-            WITH private_chats AS (
-                SELECT COUNT(*) as total, s.language, COUNT(*) as count_by_lang
-                FROM chat c
-                JOIN settings s ON c.chat_id = s.chat_id
-                WHERE c.type = 'private'
-                    AND c.created_at >= $1::TIMESTAMPTZ
-                GROUP BY s.language
-            ),
-            group_chats AS (
-                SELECT COUNT(*) as total, s.language, COUNT(*) as count_by_lang
-                FROM chat c
-                JOIN settings s ON c.chat_id = s.chat_id
-                WHERE c.type = 'group'
-                    AND c.created_at >= $1::TIMESTAMPTZ
-                GROUP BY s.language
-            ),
-            downloads_stats AS (
-                SELECT COUNT(*) as total_downloads, COALESCE(SUM(mf.file_size), 0) as total_size
-                FROM media m
-                JOIN media_item mi ON mi.media_id = m.id
-                JOIN media_format mf ON mf.item_id = mi.id
-                WHERE m.created_at >= $1::TIMESTAMPTZ
-            )
-            SELECT
-                COALESCE((SELECT SUM(total) FROM private_chats), 0)::BIGINT as total_private_chats,
-                COALESCE((SELECT jsonb_object_agg(language, count_by_lang) FROM private_chats), '{}'::jsonb) as private_chats_by_language,
-                COALESCE((SELECT SUM(total) FROM group_chats), 0)::BIGINT as total_group_chats,
-                COALESCE((SELECT jsonb_object_agg(language, count_by_lang) FROM group_chats), '{}'::jsonb) as group_chats_by_language,
-                COALESCE((SELECT total_downloads FROM downloads_stats), 0)::BIGINT as total_downloads,
-                COALESCE((SELECT total_size FROM downloads_stats), 0)::BIGINT as total_downloads_size;
-            """,
-            since_date,
-        )
+    if settings.CACHING:
+        entry = _stats_cache.get(days)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
 
-    return dict(row)
+    stats = await _fetch_stats(days)
+    if settings.CACHING:
+        _stats_cache[days] = (stats, time.monotonic() + _STATS_CACHE_TTL)
+    return stats
 
-async def insert_download(
-    *,
-    content_id: str,
-    content_url: str,
-    extractor_id: str,
-    chat_id: int,
-    media_type: str,
-    audio_codec: str,
-    video_codec: str,
-    file_size: int,
-    duration: int,
-    width: int,
-    height: int,
-    bitrate: int,
-) -> None:
-    """Persist a single downloaded format for stats/history.
-
-    This mirrors govd's media/media_item/media_format tables, but stores only
-    the single format actually downloaded.
+
+async def _fetch_stats(days: int) -> Dict[str, Any]:
+    since_date = datetime.now(tz=timezone.utc) - timedelta(days=days)
+    async with pool().acquire() as conn:
+        chat_rows = await conn.fetch(_CHAT_STATS_SQL, since_date)
+        downloads = await conn.fetchrow(_DOWNLOAD_STATS_SQL, since_date)
+
+    # one pass over the chats; the per-type roll-ups are tiny, do them here
+    by_language: Dict[str, Dict[str, int]] = {"private": {}, "group": {}}
+    for row in chat_rows:
+        by_language.setdefault(row["type"], {})[row["language"]] = row["count"]
+
+    return {
+        "total_private_chats": sum(by_language["private"].values()),
+        "private_chats_by_language": by_language["private"],
+        "total_group_chats": sum(by_language["group"].values()),
+        "group_chats_by_language": by_language["group"],
+        "total_downloads": downloads["total_downloads"],
+        "total_downloads_size": downloads["total_size"],
+    }
+
+
+_INSERT_MEDIA_BATCH_SQL = """
+    INSERT INTO media (content_id, content_url, extractor_id)
+    SELECT * FROM unnest($1::TEXT[], $2::TEXT[], $3::TEXT[])
+    ON CONFLICT (content_id, extractor_id) DO UPDATE SET updated_at = CURRENT_TIMESTAMP
+    RETURNING id, content_id, extractor_id;
+"""
+
+_INSERT_MEDIA_ITEMS_BATCH_SQL = """
+    INSERT INTO media_item (media_id)
+    SELECT unnest($1::BIGINT[])
+    RETURNING id, media_id;
+"""
+
+_MEDIA_FORMAT_COLUMNS = [
+    "item_id",
+    "format_id",
+    "file_id",
+    "type",
+    "audio_codec",
+    "video_codec",
+    "file_size",
+    "duration",
+    "width",
+    "height",
+    "bitrate",
+]
+
+
+# yt-dlp reports codecs as e.g. "avc1.64001F" or "mp4a.40.2"; map them onto
+# the media_codec enum by prefix. Anything else is stored as NULL.
+_CODEC_PREFIXES = (
+    ("avc", "avc"),
+    ("h264", "avc"),
+    ("hvc", "hevc"),
+    ("hev", "hevc"),
+    ("h265", "hevc"),
+    ("vp09", "vp9"),
+    ("vp9", "vp9"),
+    ("vp8", "vp8"),
+    ("av01", "av1"),
+    ("av1", "av1"),
+    ("webp", "webp"),
+    ("mp4a", "aac"),
+    ("aac", "aac"),
+    ("opus", "opus"),
+    ("vorbis", "vorbis"),
+    ("mp3", "mp3"),
+    ("flac", "flac"),
+)
+
+
+def _media_codec(codec: str) -> Optional[str]:
+    codec = codec.lower()
+    return next((value for prefix, value in _CODEC_PREFIXES if codec.startswith(prefix)), None)
+
+
+async def insert_downloads_batch(downloads: List[Dict[str, Any]]) -> None:
+    """Persist a batch of downloads, single files and albums alike, in one transaction.
+
+    Each entry carries content_id, content_url, extractor_id and a `formats`
+    list of dicts with file_id (Telegram's id of the sent file), media_type,
+    audio_codec, video_codec, file_size, duration, width, height and bitrate.
+    Media rows and items are written set-wise through unnest, formats are
+    streamed with COPY.
     """
+    # One media row per (content_id, extractor_id): an upsert can't touch the
+    # same row twice in one statement, so merge repeats before sending.
+    media: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for d in downloads:
+        entry = media.setdefault((d["content_id"], d["extractor_id"]), {**d, "formats": []})
+        entry["formats"].extend(d["formats"])
+    media = {key: m for key, m in media.items() if m["formats"]}
+    if not media:
+        return
+
     async with pool().acquire() as conn:
         async with conn.transaction():
-            media_id_row = await conn.fetchrow(
-                """
-                INSERT INTO media (content_id, content_url, extractor_id, chat_id)
-                VALUES ($1, $2, $3, $4)
-                RETURNING id;
-                """,
-                content_id,
-                content_url,
-                extractor_id,
-                chat_id,
+            media_rows = await conn.fetch(
+                _INSERT_MEDIA_BATCH_SQL,
+                [m["content_id"] for m in media.values()],
+                [m["content_url"] for m in media.values()],
+                [m["extractor_id"] for m in media.values()],
             )
-            media_id = media_id_row["id"]
-
-            item_id_row = await conn.fetchrow(
-                """
-                INSERT INTO media_item (media_id)
-                VALUES ($1)
-                RETURNING id;
-                """,
-                media_id,
+            media_ids = {(r["content_id"], r["extractor_id"]): r["id"] for r in media_rows}
+
+            item_rows = await conn.fetch(
+                _INSERT_MEDIA_ITEMS_BATCH_SQL,
+                [media_ids[key] for key, m in media.items() for _ in m["formats"]],
             )
-            item_id = item_id_row["id"]
-
-            await conn.execute(
-                """
-                INSERT INTO media_format (
-                    item_id, format_id, type, audio_codec, video_codec,
-                    file_size, duration, width, height, bitrate
-                )
-                VALUES ($1, 'default', $2, $3, $4, $5, $6, $7, $8, $9);
-                """,
-                item_id,
-                media_type,
-                audio_codec,
-                video_codec,
-                file_size,
-                duration,
-                width,
-                height,
-                bitrate,
+            # a media row's items are interchangeable, so hand them out in order
+            items: Dict[int, List[int]] = {}
+            for r in item_rows:
+                items.setdefault(r["media_id"], []).append(r["id"])
+
+            await conn.copy_records_to_table(
+                "media_format",
+                records=[
+                    (
+                        item_id,
+                        "default",
+                        f["file_id"],
+                        f["media_type"],
+                        _media_codec(f["audio_codec"]),
+                        _media_codec(f["video_codec"]),
+                        f["file_size"],
+                        f["duration"],
+                        f["width"],
+                        f["height"],
+                        f["bitrate"],
+                    )
+                    for key, m in media.items()
+                    for item_id, f in zip(items[media_ids[key]], m["formats"])
+                ],
+                columns=_MEDIA_FORMAT_COLUMNS,
             )
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+from app.db import queries
+from app.utils.logging import get_logger
+
+log = get_logger(__name__)
+
+# Stats and error rows are not needed to answer the user, so handlers queue
+# them here and a background task writes them in batches. Queued rows are
+# written every FLUSH_INTERVAL seconds, or as soon as FLUSH_SIZE are waiting.
+FLUSH_INTERVAL = 1.0
+FLUSH_SIZE = 100
+
+_ERROR = "error"
+_DOWNLOAD = "download"
+
+# (kind, payload) pairs; None is the stop sentinel.
+_queue: "asyncio.Queue[Optional[Tuple[str, Any]]]" = asyncio.Queue()
+_task: Optional[asyncio.Task] = None
+
+
+def log_error(error_id: str, message: str) -> None:
+    """Queue an error for the background writer without waiting on the DB."""
+    _queue.put_nowait((_ERROR, (error_id, message)))
+
+
+def insert_download(
+    *,
+    content_id: str,
+    content_url: str,
+    extractor_id: str,
+    formats: List[Dict[str, Any]],
+) -> None:
+    """Queue a download (one entry in `formats` per sent file) for the stats tables.
+
+    See `queries.insert_downloads_batch` for the keys of each format.
+    """
+    _queue.put_nowait(
+        (
+            _DOWNLOAD,
+            {
+                "content_id": content_id,
+                "content_url": content_url,
+                "extractor_id": extractor_id,
+                "formats": formats,
+            },
+        )
+    )
+
+
+async def _write(what: str, count: int, write: Awaitable[None]) -> None:
+    try:
+        await write
+    except Exception:
+        log.exception("failed to write %d %s", count, what)
+
+
+async def _flush(batch: List[Tuple[str, Any]]) -> None:
+    errors: List[Tuple[str, str]] = []
+    downloads: List[Dict[str, Any]] = []
+    for kind, payload in batch:
+        if kind == _ERROR:
+            errors.append(payload)
+        else:
+            downloads.append(payload)
+
+    if errors:
+        await _write("errors", len(errors), queries.insert_errors_bulk(errors))
+    if downloads:
+        try:
+            await queries.insert_downloads_batch(downloads)
+        except Exception:
+            log.exception("failed to write %d downloads as a batch, retrying one by one", len(downloads))
+            # the batch is one transaction; don't let a single bad row drop the rest
+            if len(downloads) > 1:
+                for download in downloads:
+                    await _write("download", 1, queries.insert_downloads_batch([download]))
+
+
+async def _run() -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await _queue.get()
+        if item is None:
+            return
+
+        batch = [item]
+        stopping = False
+        deadline = loop.time() + FLUSH_INTERVAL
+        while len(batch) < FLUSH_SIZE:
+            try:
+                item = await asyncio.wait_for(_queue.get(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+
+        await _flush(batch)
+        if stopping:
+            return
+
+
+async def start() -> None:
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_run())
+
+
+async def stop() -> None:
+    """Stop the writer after flushing everything queued so far."""
+    global _task
+    if _task is not None:
+        _queue.put_nowait(None)
+        await _task
+        _task = None
@@ -2,22 +2,54 @@ from __future__ import annotations
 
 import asyncio
 import os
+import stat
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 
-from aiohttp import ClientSession
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from async_lru import alru_cache
 from yt_dlp import YoutubeDL
 
 from app.config.settings import settings
 from app.models.media import DownloadResult, DownloadedFile
 
+# One session for the whole process, so connections, DNS lookups and TLS
+# sessions are reused across redirect resolutions.
+_http: Optional[ClientSession] = None
 
+
+async def get_http() -> ClientSession:
+    global _http
+    if _http is None or _http.closed:
+        _http = ClientSession(
+            connector=TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300),
+            timeout=ClientTimeout(total=15),
+        )
+    return _http
+
+
+async def close_http() -> None:
+    global _http
+    if _http is not None:
+        await _http.close()
+        _http = None
+
+
+# Short links resolve to the same target every time; concurrent calls for
+# the same URL also share one in-flight request.
+@alru_cache(maxsize=10_000, ttl=3600)
 async def resolve_redirect(url: str) -> str:
     """Follow HTTP redirects and return final URL."""
-    async with ClientSession() as session:
-        async with session.get(url, allow_redirects=True, timeout=15) as resp:
+    session = await get_http()
+    # Only the final URL is needed, so ask for headers alone.
+    async with session.head(url, allow_redirects=True) as resp:
+        if resp.status < 400:
             return str(resp.url)
+    # Some hosts reject HEAD (405 and friends); fall back to a GET that asks
+    # for at most one byte of body.
+    async with session.get(url, allow_redirects=True, headers={"Range": "bytes=0-0"}) as resp:
+        return str(resp.url)
 
 
 def _ydl_opts(out_dir: str) -> dict:
@@ -64,26 +96,43 @@ def _pick_codec_meta(info: dict) -> tuple[str, str, int, int, int, int]:
     return vcodec, acodec, tbr, width, height, duration
 
 
-def _file_path(out_dir: str, content_id: str, ext: str) -> str:
+def _stat_file(path: str) -> Optional[os.stat_result]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def _find_by_prefix(out_dir: str, content_id: str) -> Optional[os.DirEntry]:
+    prefix = f"{content_id}."
+    with os.scandir(out_dir) as it:
+        return next((de for de in it if de.name.startswith(prefix) and de.is_file()), None)
+
+
+def _file_stat(out_dir: str, content_id: str, ext: str) -> tuple[str, os.stat_result]:
+    # One stat per probe: it both checks existence and gives the size.
     p = os.path.join(out_dir, f"{content_id}.{ext}")
-    if os.path.exists(p):
-        return p
+    st = _stat_file(p)
+    if st is not None:
+        return p, st
     # yt-dlp often remuxes to mp4
     mp4 = os.path.join(out_dir, f"{content_id}.mp4")
-    if os.path.exists(mp4):
-        return mp4
-    # fallback: find any file starting with id
-    for f in Path(out_dir).glob(f"{content_id}.*"):
-        if f.is_file():
-            return str(f)
-    return p
+    st = _stat_file(mp4)
+    if st is not None:
+        return mp4, st
+    # fallback: find any file starting with id. out_dir is shared by every
+    # download, so only scan it when the expected names are missing.
+    de = _find_by_prefix(out_dir, content_id)
+    if de is not None:
+        return de.path, de.stat()
+    return p, os.stat(p)
 
 
 def _as_downloaded_file(out_dir: str, info: dict) -> DownloadedFile:
     content_id = str(info.get("id") or "unknown")
     ext = str(info.get("ext") or "mp4")
-    path = _file_path(out_dir, content_id, ext)
-    st = os.stat(path)
+    path, st = _file_stat(out_dir, content_id, ext)
 
     vcodec, acodec, tbr, width, height, duration = _pick_codec_meta(info)
 
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import re
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import urlsplit
 
 
 @dataclass
@@ -11,9 +14,16 @@ class Extractor:
     display_name: str
     hosts: List[str]
     url_pattern: re.Pattern
+    # Position in a chat's disabled-extractors bitmask. Persisted in the DB,
+    # so never reuse or renumber a bit.
+    bit: int
     hidden: bool = False
     redirect: bool = False
 
+    @property
+    def mask(self) -> int:
+        return 1 << self.bit
+
 
 def _p(pattern: str) -> re.Pattern:
     return re.compile(pattern, re.IGNORECASE)
@@ -25,12 +35,14 @@ EXTRACTORS: List[Extractor] = [
         display_name="TikTok",
         hosts=["tiktok.com"],
         url_pattern=_p(r"https?://(www\.)?tiktok\.com/.*"),
+        bit=0,
     ),
     Extractor(
         id="tiktok_vm",
         display_name="TikTok (vm)",
         hosts=["vm.tiktok.com"],
         url_pattern=_p(r"https?://vm\.tiktok\.com/.*"),
+        bit=1,
         redirect=True,
         hidden=True,
     ),
@@ -39,12 +51,14 @@ EXTRACTORS: List[Extractor] = [
         display_name="SoundCloud",
         hosts=["soundcloud.com"],
         url_pattern=_p(r"https?://(www\.)?soundcloud\.com/.*"),
+        bit=2,
     ),
     Extractor(
         id="soundcloud_short",
         display_name="SoundCloud (on\.soundcloud)",
         hosts=["on.soundcloud.com"],
         url_pattern=_p(r"https?://on\.soundcloud\.com/.*"),
+        bit=3,
         redirect=True,
         hidden=True,
     ),
@@ -53,12 +67,14 @@ EXTRACTORS: List[Extractor] = [
         display_name="X / Twitter",
         hosts=["x.com", "twitter.com"],
         url_pattern=_p(r"https?://(www\.)?(x|twitter)\.com/.*"),
+        bit=4,
     ),
     Extractor(
         id="twitter_short",
         display_name="t\.co",
         hosts=["t.co"],
         url_pattern=_p(r"https?://t\.co/.*"),
+        bit=5,
         redirect=True,
         hidden=True,
     ),
@@ -67,12 +83,14 @@ EXTRACTORS: List[Extractor] = [
         display_name="Instagram",
         hosts=["instagram.com"],
         url_pattern=_p(r"https?://(www\.)?instagram\.com/.*"),
+        bit=6,
     ),
     Extractor(
         id="instagram_stories",
         display_name="Instagram Stories",
         hosts=["instagram.com"],
         url_pattern=_p(r"https?://(www\.)?instagram\.com/stories/.*"),
+        bit=7,
         hidden=True,
     ),
     Extractor(
@@ -80,6 +98,7 @@ EXTRACTORS: List[Extractor] = [
         display_name="Instagram Share",
         hosts=["instagram.com"],
         url_pattern=_p(r"https?://(www\.)?instagram\.com/share/.*"),
+        bit=8,
         redirect=True,
         hidden=True,
     ),
@@ -88,24 +107,28 @@ EXTRACTORS: List[Extractor] = [
         display_name="9GAG",
         hosts=["9gag.com"],
         url_pattern=_p(r"https?://(www\.)?9gag\.com/.*"),
+        bit=9,
     ),
     Extractor(
         id="youtube",
         display_name="YouTube",
         hosts=["youtube.com", "youtu.be"],
         url_pattern=_p(r"https?://(www\.)?(youtube\.com|youtu\.be)/.*"),
+        bit=10,
     ),
     Extractor(
         id="pinterest",
         display_name="Pinterest",
         hosts=["pinterest.com"],
         url_pattern=_p(r"https?://(www\.)?pinterest\.com/.*"),
+        bit=11,
     ),
     Extractor(
         id="pinterest_short",
         display_name="Pinterest (pin\.it)",
         hosts=["pin.it"],
         url_pattern=_p(r"https?://pin\.it/.*"),
+        bit=12,
         redirect=True,
         hidden=True,
     ),
@@ -114,12 +137,14 @@ EXTRACTORS: List[Extractor] = [
         display_name="Reddit",
         hosts=["reddit.com"],
         url_pattern=_p(r"https?://(www\.)?reddit\.com/.*"),
+        bit=13,
     ),
     Extractor(
         id="reddit_short",
         display_name="Reddit (redd\.it)",
         hosts=["redd.it"],
         url_pattern=_p(r"https?://redd\.it/.*"),
+        bit=14,
         redirect=True,
         hidden=True,
     ),
@@ -128,16 +153,56 @@ EXTRACTORS: List[Extractor] = [
         display_name="Threads",
         hosts=["threads.net"],
         url_pattern=_p(r"https?://(www\.)?threads\.net/.*"),
+        bit=15,
     ),
 ]
 
 
+_BY_ID: Dict[str, Extractor] = {e.id: e for e in EXTRACTORS}
+
+
+def get_extractor(extractor_id: str) -> Optional[Extractor]:
+    return _BY_ID.get(extractor_id)
+
+
+def extractor_ids(mask: int) -> FrozenSet[str]:
+    """Ids of the extractors whose bits are set in mask."""
+    return frozenset(e.id for e in EXTRACTORS if mask & e.mask)
+
+
+# All url_patterns folded into one alternation so a URL is scanned once
+# instead of once per extractor. Alternatives are tried in EXTRACTORS order,
+# so the first extractor that matches still wins.
+_COMBINED = re.compile(
+    "|".join(f"(?P<g{i}>{e.url_pattern.pattern})" for i, e in enumerate(EXTRACTORS)),
+    re.IGNORECASE,
+)
+_BY_GROUP = {f"g{i}": e for i, e in enumerate(EXTRACTORS)}
+
+
+# host -> candidate extractors, in EXTRACTORS order. Most URLs are decided by
+# their host alone; the regex only has to tell same-host extractors apart.
+_HOST_INDEX: Dict[str, List[Extractor]] = defaultdict(list)
+for _ex in EXTRACTORS:
+    for _host in _ex.hosts:
+        _HOST_INDEX[_host.lower().removeprefix("www.")].append(_ex)
+del _ex, _host
+
+
 def match_extractor(url: str) -> Optional[Extractor]:
-    for ex in EXTRACTORS:
+    try:
+        host = (urlsplit(url).hostname or "").removeprefix("www.")
+    except ValueError:
+        host = ""
+    for ex in _HOST_INDEX.get(host, ()):
         if ex.url_pattern.match(url):
             return ex
-    return None
+
+    m = _COMBINED.match(url)
+    return _BY_GROUP[m.lastgroup] if m else None
 
 
-def list_visible_extractors() -> List[Extractor]:
-    return [e for e in EXTRACTORS if not e.hidden]
+@lru_cache(maxsize=1)
+def list_visible_extractors() -> Tuple[Extractor, ...]:
+    # EXTRACTORS is fixed at import time, so the snapshot never goes stale.
+    return tuple(e for e in EXTRACTORS if not e.hidden)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Optional, Tuple
 
 from app.utils.logging import get_logger
 
@@ -13,33 +16,67 @@ except ModuleNotFoundError:  # pragma: no cover
 log = get_logger(__name__)
 
 _LOCALES: Dict[str, Dict[str, str]] = {}
+_LANGUAGES: Dict[str, str] = {}
+# Per-language tables with the "en" fallbacks already folded in, so a lookup
+# is a single probe.
+_MERGED: Dict[str, Dict[str, str]] = {}
+_DEFAULT_TABLE: Dict[str, str] = {}
+
+
+def _message(value: Any) -> Optional[str]:
+    # go-i18n translation files store messages as tables: {hash = ..., other = "..."}
+    if isinstance(value, dict):
+        value = value.get("other")
+    return value if isinstance(value, str) else None
+
+
+def _load_one(file: Path) -> Tuple[str, Optional[Dict[str, str]]]:
+    lang = file.stem.split(".")[-1]
+    try:
+        data = tomllib.loads(file.read_text(encoding="utf-8"))
+    except Exception as e:
+        log.exception("failed to load locale %s: %s", file, e)
+        return lang, None
+    return lang, {k: m for k, v in data.items() if (m := _message(v)) is not None}
 
 
 def init_locales() -> None:
     """Load TOML translations shipped in app/i18n/locales."""
     locales_dir = Path(__file__).resolve().parent / "locales"
-    for file in locales_dir.glob("active.*.toml"):
-        lang = file.stem.split(".")[-1]
-        try:
-            data = tomllib.loads(file.read_text(encoding="utf-8"))
-            _LOCALES[lang] = {str(k): str(v) for k, v in data.items()}
-        except Exception as e:
-            log.exception("failed to load locale %s: %s", file, e)
+    files = sorted(locales_dir.glob("active.*.toml"))
+    # read and parse the files concurrently, then fill the tables in order
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for lang, table in pool.map(_load_one, files):
+            if table is not None:
+                _LOCALES[lang] = table
 
     if "en" not in _LOCALES:
         raise RuntimeError("missing base locale: en")
 
+    global _DEFAULT_TABLE
+    base = _LOCALES["en"]
+    _MERGED.clear()
+    for code, table in _LOCALES.items():
+        # empty translations fall back to English, as lookups always did
+        merged = {**base, **{k: v for k, v in table.items() if v}}
+        _MERGED[code] = {sys.intern(k): v for k, v in merged.items()}
+    _DEFAULT_TABLE = _MERGED["en"]
+
+    # kept sorted by code so menus can iterate it as-is
+    _LANGUAGES.clear()
+    for code in sorted(_LOCALES):
+        _LANGUAGES[code] = _LOCALES[code].get("Language", code)
+    t.cache_clear()
+
     log.info("i18n: loaded %d locales", len(_LOCALES))
 
 
+# Translations are immutable once loaded, so lookups are memoized.
+@lru_cache(maxsize=8192)
 def t(key: str, lang: str = "en") -> str:
-    table = _LOCALES.get(lang) or _LOCALES.get("en", {})
-    return table.get(key) or _LOCALES.get("en", {}).get(key) or key
+    return _MERGED.get(lang, _DEFAULT_TABLE).get(key) or key
 
 
 def available_languages() -> Dict[str, str]:
-    """Returns mapping lang_code -> localized language name (from each locale's 'Language' key)."""
-    out: Dict[str, str] = {}
-    for code, table in _LOCALES.items():
-        out[code] = table.get("Language", code)
-    return out
+    """Returns mapping lang_code -> localized language name (from each locale's 'Language' key), sorted by code."""
+    return _LANGUAGES
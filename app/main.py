@@ -1,7 +1,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import os
 
 import uvloop
@@ -9,9 +8,12 @@ from prometheus_client import start_http_server
 
 from app.bot.bot_app import create_bot, create_dispatcher
 from app.bot.handlers import router as main_router
+from app.bot.webhook import run_webhook
 from app.config.settings import settings
 from app.db.pool import close_pool, init_pool
 from app.db.migrations import run_migrations
+from app.db.queries import listen_chat_invalidations
+from app.extractors.downloader import close_http
 from app.i18n.localizer import init_locales
 from app.utils.ffmpeg import check_ffmpeg
 from app.utils.logging import get_logger, init_logging
@@ -29,6 +31,8 @@ async def _startup() -> None:
 
     await init_pool()
     await run_migrations()
+    if settings.CACHING:
+        await listen_chat_invalidations()
 
     if settings.METRICS_PORT and settings.METRICS_PORT > 0:
         start_http_server(settings.METRICS_PORT)
@@ -38,19 +42,25 @@ async def _startup() -> None:
     dp = create_dispatcher()
     dp.include_router(main_router)
 
-    log.info("starting bot polling")
-    await dp.start_polling(bot)
+    if settings.WEBHOOK_URL:
+        log.info("starting bot webhook")
+        await run_webhook(bot, dp)
+    else:
+        log.info("starting bot polling")
+        await dp.start_polling(bot)
 
 
-def main() -> None:
-    uvloop.install()
+async def _run() -> None:
     try:
-        asyncio.run(_startup())
+        await _startup()
     finally:
-        try:
-            asyncio.run(close_pool())
-        except Exception:
-            pass
+        # close on the same loop that created the pool
+        await close_http()
+        await close_pool()
+
+
+def main() -> None:
+    uvloop.run(_run())
 
 
 if __name__ == "__main__":
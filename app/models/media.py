@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class MediaFormat:
     format_id: str
     media_type: str  # 'video' | 'audio' | 'photo' | 'document'
@@ -21,7 +21,7 @@ class MediaFormat:
     thumbnail_url: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MediaItem:
     formats: List[MediaFormat] = field(default_factory=list)
 
@@ -31,20 +31,17 @@ class MediaItem:
         # Prefer AVC/H264 MP4-ish video formats (Telegram friendly)
         vids = [f for f in self.formats if f.media_type == "video"]
         if vids:
-            vids.sort(key=lambda f: (f.bitrate, f.height, f.width), reverse=True)
-            return vids[0]
+            return max(vids, key=lambda f: (f.bitrate, f.height, f.width))
         auds = [f for f in self.formats if f.media_type == "audio"]
         if auds:
-            auds.sort(key=lambda f: f.bitrate, reverse=True)
-            return auds[0]
+            return max(auds, key=lambda f: f.bitrate)
         photos = [f for f in self.formats if f.media_type == "photo"]
         if photos:
-            photos.sort(key=lambda f: (f.width * f.height, f.file_size), reverse=True)
-            return photos[0]
+            return max(photos, key=lambda f: (f.width * f.height, f.file_size))
         return self.formats[0]
 
 
-@dataclass
+@dataclass(slots=True)
 class Media:
     content_id: str
     content_url: str
@@ -59,7 +56,7 @@ class Media:
         return item
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadedFile:
     path: str
     media_type: str
@@ -72,7 +69,7 @@ class DownloadedFile:
     audio_codec: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadResult:
     content_id: str
     extractor_id: str
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import functools
 import shutil
 
 
+# PATH doesn't change while the bot runs, so probe it once.
+@functools.cache
 def check_ffmpeg() -> bool:
     return shutil.which("ffmpeg") is not None
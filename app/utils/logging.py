@@ -11,6 +11,14 @@ def init_logging(level: str = "INFO") -> None:
         format="%(asctime)s %(levelname)s %(name)s %(message)s",
         stream=sys.stdout,
     )
+    # The format above never prints thread/process info or source location,
+    # so don't collect it on every LogRecord. The tradeoff: %(thread)s,
+    # %(process)s, %(pathname)s, %(lineno)d and friends come out empty/unknown
+    # if someone adds them to the format later.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
 
 
 def get_logger(name: str) -> logging.Logger:
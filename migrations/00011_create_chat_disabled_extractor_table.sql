@@ -0,0 +1,23 @@
+-- +goose Up
+-- +goose StatementBegin
+CREATE TABLE IF NOT EXISTS chat_disabled_extractor (
+    chat_id BIGINT NOT NULL REFERENCES chat(chat_id) ON DELETE CASCADE,
+    extractor_id TEXT NOT NULL,
+    PRIMARY KEY (chat_id, extractor_id)
+);
+
+INSERT INTO chat_disabled_extractor (chat_id, extractor_id)
+SELECT chat_id, unnest(disabled_extractors) FROM settings
+ON CONFLICT DO NOTHING;
+
+ALTER TABLE settings DROP COLUMN disabled_extractors;
+-- +goose StatementEnd
+
+-- +goose Down
+-- +goose StatementBegin
+ALTER TABLE settings ADD COLUMN disabled_extractors TEXT[] DEFAULT '{}' NOT NULL;
+UPDATE settings s SET disabled_extractors = ARRAY(
+    SELECT d.extractor_id FROM chat_disabled_extractor d WHERE d.chat_id = s.chat_id
+);
+DROP TABLE IF EXISTS chat_disabled_extractor;
+-- +goose StatementEnd
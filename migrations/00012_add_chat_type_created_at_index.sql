@@ -0,0 +1,10 @@
+-- +goose Up
+-- +goose StatementBegin
+CREATE INDEX IF NOT EXISTS idx_chat_type_created_at
+    ON chat (type, created_at);
+-- +goose StatementEnd
+
+-- +goose Down
+-- +goose StatementBegin
+DROP INDEX IF EXISTS idx_chat_type_created_at;
+-- +goose StatementEnd
@@ -0,0 +1,15 @@
+-- +goose Up
+-- +goose StatementBegin
+CREATE INDEX IF NOT EXISTS idx_media_created_at
+    ON media (created_at);
+
+-- lets the stats join read file_size without visiting media_format rows
+CREATE INDEX IF NOT EXISTS idx_format_item_id_file_size
+    ON media_format (item_id) INCLUDE (file_size);
+-- +goose StatementEnd
+
+-- +goose Down
+-- +goose StatementBegin
+DROP INDEX IF EXISTS idx_media_created_at;
+DROP INDEX IF EXISTS idx_format_item_id_file_size;
+-- +goose StatementEnd
@@ -0,0 +1,65 @@
+-- +goose Up
+-- +goose StatementBegin
+-- Bits must match Extractor.bit in app/extractors/registry.py.
+ALTER TABLE settings ADD COLUMN disabled_extractors_mask BIGINT NOT NULL DEFAULT 0;
+
+UPDATE settings s SET disabled_extractors_mask = COALESCE((
+    SELECT bit_or(
+        CASE d.extractor_id
+            WHEN 'tiktok' THEN 1
+            WHEN 'tiktok_vm' THEN 2
+            WHEN 'soundcloud' THEN 4
+            WHEN 'soundcloud_short' THEN 8
+            WHEN 'twitter' THEN 16
+            WHEN 'twitter_short' THEN 32
+            WHEN 'instagram' THEN 64
+            WHEN 'instagram_stories' THEN 128
+            WHEN 'instagram_share' THEN 256
+            WHEN 'ninegag' THEN 512
+            WHEN 'youtube' THEN 1024
+            WHEN 'pinterest' THEN 2048
+            WHEN 'pinterest_short' THEN 4096
+            WHEN 'reddit' THEN 8192
+            WHEN 'reddit_short' THEN 16384
+            WHEN 'threads' THEN 32768
+        END
+    )
+    FROM chat_disabled_extractor d
+    WHERE d.chat_id = s.chat_id
+), 0);
+
+DROP TABLE IF EXISTS chat_disabled_extractor;
+-- +goose StatementEnd
+
+-- +goose Down
+-- +goose StatementBegin
+CREATE TABLE IF NOT EXISTS chat_disabled_extractor (
+    chat_id BIGINT NOT NULL REFERENCES chat(chat_id) ON DELETE CASCADE,
+    extractor_id TEXT NOT NULL,
+    PRIMARY KEY (chat_id, extractor_id)
+);
+
+INSERT INTO chat_disabled_extractor (chat_id, extractor_id)
+SELECT s.chat_id, e.extractor_id
+FROM settings s
+JOIN (VALUES
+    ('tiktok', 1),
+    ('tiktok_vm', 2),
+    ('soundcloud', 4),
+    ('soundcloud_short', 8),
+    ('twitter', 16),
+    ('twitter_short', 32),
+    ('instagram', 64),
+    ('instagram_stories', 128),
+    ('instagram_share', 256),
+    ('ninegag', 512),
+    ('youtube', 1024),
+    ('pinterest', 2048),
+    ('pinterest_short', 4096),
+    ('reddit', 8192),
+    ('reddit_short', 16384),
+    ('threads', 32768)
+) AS e (extractor_id, mask) ON s.disabled_extractors_mask & e.mask <> 0;
+
+ALTER TABLE settings DROP COLUMN IF EXISTS disabled_extractors_mask;
+-- +goose StatementEnd
@@ -0,0 +1,11 @@
+-- +goose Up
+-- +goose StatementBegin
+-- files sent as plain documents (neither audio nor video track)
+ALTER TYPE media_type ADD VALUE IF NOT EXISTS 'document';
+-- +goose StatementEnd
+
+-- +goose Down
+-- +goose StatementBegin
+-- enum values can't be dropped; 'document' is left in place
+SELECT 1;
+-- +goose StatementEnd